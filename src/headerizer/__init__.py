@@ -1 +1,4 @@
-# File: src/headerizer/__init__.py
\ No newline at end of file
+# File: src/headerizer/__init__.py
+from headerizer.processor import Headerizer, FileResult
+
+__all__ = ["Headerizer", "FileResult"]
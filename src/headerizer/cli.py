@@ -1,18 +1,80 @@
 # File: src/headerizer/cli.py
 import sys
 from headerizer.config import load_config
-from headerizer.processor import find_and_process_files
+from headerizer.processor import find_and_process_files, rollback_run, strip_headers, migrate_headers
+from headerizer.shard import parse_shard, merge_result_files
 
 def cli():
     use_relative = False
     target_dir = "."
     print_written=False
-    for arg in sys.argv[1:]:
+    index_path = None
+    journal_path = None
+    resume = False
+    rollback = False
+    show_progress = False
+    shard = None
+    results_path = None
+    strip = False
+    migrate = None
+    since = None
+    args = iter(sys.argv[1:])
+    for arg in args:
         if arg.startswith('--'):
             if arg == '--relative':
                 use_relative = True
             elif arg == '--print':
                 print_written = True
+            elif arg == '--index':
+                index_path = next(args, None)
+                if index_path is None:
+                    print("❌ Error: --index requires a file path")
+                    sys.exit(1)
+            elif arg == '--journal':
+                journal_path = next(args, None)
+                if journal_path is None:
+                    print("❌ Error: --journal requires a file path")
+                    sys.exit(1)
+            elif arg == '--resume':
+                resume = True
+            elif arg == '--rollback':
+                rollback = True
+            elif arg == '--progress':
+                show_progress = True
+            elif arg == '--shard':
+                spec = next(args, None)
+                if spec is None:
+                    print("❌ Error: --shard requires i/N")
+                    sys.exit(1)
+                try:
+                    shard = parse_shard(spec)
+                except ValueError as e:
+                    print(f"❌ Error: {e}")
+                    sys.exit(1)
+            elif arg == '--results':
+                results_path = next(args, None)
+                if results_path is None:
+                    print("❌ Error: --results requires a file path")
+                    sys.exit(1)
+            elif arg == '--strip':
+                strip = True
+            elif arg == '--migrate':
+                migrate = (next(args, None), next(args, None))
+                if None in migrate:
+                    print("❌ Error: --migrate requires OLD_PREFIX and NEW_PREFIX")
+                    sys.exit(1)
+            elif arg == '--since':
+                since = next(args, None)
+                if since is None:
+                    print("❌ Error: --since requires a Git revision")
+                    sys.exit(1)
+            elif arg == '--merge':
+                merge_paths = list(args)
+                if len(merge_paths) < 2:
+                    print("❌ Error: --merge requires an output path and at least one results file")
+                    sys.exit(1)
+                merge(merge_paths[0], merge_paths[1:])
+                return
             elif arg == '--help':
                 print_help()
                 return
@@ -36,21 +98,115 @@ def cli():
         else:
             target_dir = arg
 
+    if (resume or rollback) and journal_path is None:
+        print("❌ Error: --resume and --rollback require --journal PATH")
+        sys.exit(1)
+
+    if rollback:
+        rollback_run(journal_path)
+        return
+
+    if resume and results_path is not None:
+        # A resumed run only sees the files that were still pending
+        print("❌ Error: --results cannot be combined with --resume")
+        sys.exit(1)
+
+    if strip and migrate:
+        print("❌ Error: --strip and --migrate cannot be combined")
+        sys.exit(1)
+
+    if since is not None and not migrate:
+        print("❌ Error: --since can only be used with --migrate")
+        sys.exit(1)
+
+    if strip or migrate:
+        mode = '--strip' if strip else '--migrate'
+        unsupported = [
+            flag for flag, value in [
+                ('-r/--relative', use_relative or None),
+                ('--journal', journal_path),
+                ('--resume', resume or None),
+                ('--index', index_path),
+                ('--results', results_path),
+                ('--shard', shard if migrate else None),
+            ]
+            if value is not None
+        ]
+        if unsupported:
+            print(f"❌ Error: {', '.join(unsupported)} cannot be combined with {mode}")
+            sys.exit(1)
+
     file_types, default_ignore = load_config()
+
+    if strip:
+        strip_headers(
+            target_dir,
+            file_types,
+            default_ignore=default_ignore,
+            print_written=print_written,
+            show_progress=show_progress,
+            shard=shard
+        )
+        return
+
+    if migrate:
+        migrate_headers(
+            target_dir,
+            file_types,
+            migrate[0],
+            migrate[1],
+            since=since or "HEAD",
+            default_ignore=default_ignore,
+            print_written=print_written,
+            show_progress=show_progress
+        )
+        return
+
     print("Starting header insertion...")
     find_and_process_files(
         target_dir,
         file_types,
         use_relative=use_relative,
         default_ignore=default_ignore,
-        print_written=print_written
+        print_written=print_written,
+        index_path=index_path,
+        journal_path=journal_path,
+        resume=resume,
+        show_progress=show_progress,
+        shard=shard,
+        results_path=results_path
     )
 
+def merge(output_path, results_paths):
+    try:
+        merged = merge_result_files(output_path, results_paths)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: Could not merge results: {e}")
+        sys.exit(1)
+
+    counts = merged['counts']
+    print(f"Merged {len(results_paths)} result file(s) into {output_path}: "
+          f"{counts['written']} written, {counts['skipped']} skipped, {counts['error']} error(s).")
+    if merged['missing']:
+        print(f"⚠️  Missing shard(s): {', '.join(merged['missing'])}")
+
 def print_help():
     print("Usage: headerizer [options] [directory]")
     print("\nOptions:")
     print("  -r, --relative     Use paths relative to Git root in headers")
     print("  -p, --print        Print each file that a header was added to")
+    print("  --index PATH       Use and update a content-hash skip index at PATH")
+    print("  --journal PATH     Write headers in batches, journaling originals at PATH")
+    print("  --resume           Resume the interrupted run recorded in --journal")
+    print("  --rollback         Restore original headers from --journal")
+    print("  --progress         Show files/s, MB/s, ETA and counts while running")
+    print("  --shard i/N        Process only shard i of N (1-based)")
+    print("  --results PATH     Write per-file results as JSON to PATH")
+    print("  --merge OUT IN...  Merge per-shard JSON results into OUT and exit")
+    print("  --strip            Remove headers instead of adding them")
+    print("  --migrate OLD NEW  Rewrite header paths starting with OLD to start with NEW")
+    print("                     in files Git reports as renamed")
+    print("  --since REV        Revision to detect renames against (default: HEAD)")
     print("  -h, --help         Show this help message")
 
 if __name__ == "__main__":
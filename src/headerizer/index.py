@@ -0,0 +1,124 @@
+# File: src/headerizer/index.py
+import hashlib
+import mmap
+import os
+from pathlib import Path
+
+# On-disk layout: MAGIC followed by fixed-size records sorted bytewise.
+# Each record is a content key (hash of the first block plus file size)
+# followed by a digest of the header path that content is correct for.
+MAGIC = b'HDRIDX1\n'
+BLOCK_SIZE = 4096
+CONTENT_KEY_SIZE = 16
+PATH_KEY_SIZE = 8
+RECORD_SIZE = CONTENT_KEY_SIZE + PATH_KEY_SIZE
+
+def content_key(file_path):
+    return content_key_and_size(file_path)[0]
+
+def content_key_and_size(file_path):
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        block = f.read(BLOCK_SIZE)
+    digest = hashlib.blake2b(block, digest_size=CONTENT_KEY_SIZE)
+    digest.update(size.to_bytes(8, 'little'))
+    return digest.digest(), size
+
+def path_key(header_path):
+    return hashlib.blake2b(header_path.encode('utf-8'), digest_size=PATH_KEY_SIZE).digest()
+
+class SkipIndex:
+    def __init__(self, index_path):
+        self.index_path = Path(index_path)
+        self._file = None
+        self._mm = None
+        self._count = 0
+        self._added = set()
+        self._hits = set()
+        self._visited = set()
+        self._load()
+
+    def _load(self):
+        if not self.index_path.exists():
+            return
+        try:
+            self._file = open(self.index_path, 'rb')
+            size = os.fstat(self._file.fileno()).st_size
+            if size <= len(MAGIC):
+                self.close()
+                return
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._mm[:len(MAGIC)] != MAGIC or (size - len(MAGIC)) % RECORD_SIZE:
+                print(f"Warning: Ignoring invalid skip index {self.index_path}")
+                self.close()
+                return
+            self._count = (size - len(MAGIC)) // RECORD_SIZE
+        except OSError as e:
+            print(f"Warning: Could not read skip index {self.index_path}: {e}")
+            self.close()
+
+    def _record_at(self, i):
+        offset = len(MAGIC) + i * RECORD_SIZE
+        return self._mm[offset:offset + RECORD_SIZE]
+
+    def __len__(self):
+        return self._count + len(self._added)
+
+    def contains(self, key, header_path):
+        record = key + path_key(header_path)
+        self._visited.add(record[CONTENT_KEY_SIZE:])
+        if record in self._added:
+            return True
+
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            current = self._record_at(mid)
+            if current == record:
+                self._hits.add(record)
+                return True
+            if current < record:
+                lo = mid + 1
+            else:
+                hi = mid
+        return False
+
+    def add(self, key, header_path):
+        record = key + path_key(header_path)
+        self._visited.add(record[CONTENT_KEY_SIZE:])
+        self._added.add(record)
+
+    def save(self):
+        # A record is dropped only when its path was visited during this run
+        # and the content no longer matches, so runs over a subdirectory or a
+        # shard keep the entries for the rest of the tree
+        if not self._added and not self._visited:
+            return
+        kept = [
+            record for record in (self._record_at(i) for i in range(self._count))
+            if record in self._hits or record[CONTENT_KEY_SIZE:] not in self._visited
+        ]
+        if not self._added and len(kept) == self._count:
+            return
+        records = set(kept) | self._added
+        self.close()
+
+        tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(b''.join(sorted(records)))
+        os.replace(tmp_path, self.index_path)
+
+        self._added = set()
+        self._hits = set()
+        self._visited = set()
+        self._load()
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._count = 0
@@ -0,0 +1,126 @@
+# File: src/headerizer/journal.py
+import json
+import os
+from pathlib import Path
+from headerizer.utils import atomic_write
+
+BATCH_SIZE = 64
+
+# The journal is a JSON-lines file:
+#   {"plan": [...], "root": r, "use_relative": b}    files targeted by the run and
+#                                                    the settings for their headers
+#   {"batch": n, "path": p, "line": i,
+#    "original": line-or-null, "header": h}          header change, made durable
+#                                                    before the batch is written
+#   {"commit": n, "paths": [...]}                    files finished in batch n
+class Journal:
+    def __init__(self, journal_path):
+        self.journal_path = Path(journal_path)
+        self.plan = None
+        self.root = None
+        self.use_relative = None
+        self.changes = []
+        self.done = set()
+        self._batch = 0
+        self._file = None
+        self._load()
+
+    def _load(self):
+        if not self.journal_path.exists():
+            return
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted append
+                    break
+                if 'plan' in record:
+                    self.plan = record['plan']
+                    self.root = record.get('root')
+                    self.use_relative = record.get('use_relative')
+                elif 'commit' in record:
+                    self.done.update(record['paths'])
+                    self._batch = max(self._batch, record['commit'])
+                elif 'batch' in record:
+                    self.changes.append(record)
+                    self._batch = max(self._batch, record['batch'])
+
+    def exists(self):
+        return self.plan is not None
+
+    def pending(self):
+        return [Path(p) for p in self.plan if p not in self.done]
+
+    def start(self, target_files, root, use_relative):
+        self.plan = [str(p) for p in target_files]
+        self.root = str(root)
+        self.use_relative = use_relative
+        self._append([{'plan': self.plan, 'root': self.root, 'use_relative': use_relative}])
+
+    def record_batch(self, changes):
+        self._batch += 1
+        records = [
+            {'batch': self._batch, 'path': str(path), 'line': line, 'original': original, 'header': header}
+            for path, (line, original, header) in changes
+        ]
+        self._append(records)
+        self.changes.extend(records)
+        return self._batch
+
+    def commit_batch(self, batch, paths):
+        paths = [str(p) for p in paths]
+        self._append([{'commit': batch, 'paths': paths}])
+        self.done.update(paths)
+
+    def _append(self, records):
+        if self._file is None:
+            self._file = open(self.journal_path, 'a', encoding='utf-8')
+        self._file.write(''.join(json.dumps(r) + '\n' for r in records))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def rollback(self):
+        # Returns the number of files restored and the number that failed
+        restored = failed = 0
+        for change in reversed(self.changes):
+            status = _restore_header(Path(change['path']), change['line'], change['original'], change['header'])
+            if status == "restored":
+                restored += 1
+            elif status == "error":
+                failed += 1
+        return restored, failed
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        self.close()
+        self.journal_path.unlink(missing_ok=True)
+
+def _restore_header(file_path, line_index, original_line, header):
+    try:
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
+            lines = f.read().splitlines(keepends=True)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error restoring {file_path}: {e}")
+        return "error"
+
+    # Only undo changes that are still in place
+    if line_index >= len(lines) or lines[line_index].rstrip('\r\n') != header:
+        return "skipped"
+
+    if original_line is None:
+        del lines[line_index]
+    else:
+        ending = lines[line_index][len(header):]
+        lines[line_index] = original_line + ending
+
+    try:
+        atomic_write(file_path, ''.join(lines), newline='')
+    except OSError as e:
+        print(f"Error restoring {file_path}: {e}")
+        return "error"
+    return "restored"
@@ -1,102 +1,594 @@
 # File: src/headerizer/processor.py
+import os
+import sys
+from dataclasses import dataclass
 from pathlib import Path
-from headerizer.utils import load_headerignore, should_ignore, get_file_type_config, find_git_root
+from headerizer.config import load_config
+from headerizer.utils import load_headerignore, should_ignore, compile_ignore_patterns, find_git_root, find_renamed_files, atomic_write
+from headerizer.index import SkipIndex, content_key, content_key_and_size
+from headerizer.journal import Journal, BATCH_SIZE
+from headerizer.progress import ProgressReporter
+from headerizer.shard import select_shard, write_results
+
+def find_header_line(lines):
+    # Check for an existing header in the first 3 lines
+    return next(
+        (i for i, line in enumerate(lines[:3]) if "File:" in line), None
+    )
+
+def replace_header_line(content, new_header):
+    lines = content.splitlines()
+
+    header_line_index = find_header_line(lines)
+
+    if header_line_index is not None:
+        original_line = lines[header_line_index]
+        lines[header_line_index] = new_header
+    else:
+        original_line = None
+        # If first line is a shebang, insert after it
+        header_line_index = 1 if lines and lines[0].startswith("#!") else 0
+        lines.insert(header_line_index, new_header)
+
+    new_content = "\n".join(lines) + ("\n" if content.endswith("\n") else "")
+    return new_content, (header_line_index, original_line, new_header)
+
+def _write_header(file_path, new_header):
+    # Returns the status and the size of the file read, in bytes
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    new_content, _ = replace_header_line(content, new_header)
+
+    if new_content != content:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(new_content)
+        return "written", len(content.encode('utf-8'))
+    else:
+        return "skipped", len(content.encode('utf-8'))
+
+def rewrite_header_in_head(file_path, transform):
+    # Only the first 3 lines are read unless the header actually changes.
+    # transform maps the existing header line to a new line, or None to
+    # remove it. Returns the status and the new header line (or None).
+    with open(file_path, 'r', encoding='utf-8', newline='') as f:
+        head = [line for line in (f.readline() for _ in range(3)) if line]
+        lines = [line.rstrip('\r\n') for line in head]
+        header_line_index = find_header_line(lines)
+        if header_line_index is None:
+            return "skipped", None
+
+        old_line = lines[header_line_index]
+        new_line = transform(old_line)
+        if new_line == old_line:
+            return "skipped", None
+        rest = f.read()
+
+    if new_line is None:
+        del head[header_line_index]
+    else:
+        head[header_line_index] = new_line + head[header_line_index][len(old_line):]
+
+    atomic_write(file_path, ''.join(head) + rest, newline='')
+    return "written", new_line
 
 def add_header_to_file(file_path, file_types, header_path, comment_prefix):
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        status, _ = _write_header(file_path, f"{comment_prefix}File: {header_path}")
+        return status
+    except Exception as e:
+        print(f"Error processing {file_path}: {e}")
+        return "error"
 
-        lines = content.splitlines()
-        new_header = f"{comment_prefix}File: {header_path}"
+@dataclass(frozen=True)
+class FileResult:
+    path: Path
+    display_path: str
+    header_path: str
+    status: str
+    error: str | None = None
+    size: int = 0
 
-        # Check for an existing header in the first 3 lines
-        header_line_index = next(
-            (i for i, line in enumerate(lines[:3]) if "File:" in line), None
-        )
+class Headerizer:
+    def __init__(self, file_types=None, default_ignore=None, use_relative=False, index_path=None):
+        if file_types is None:
+            file_types, config_ignore = load_config()
+            if default_ignore is None:
+                default_ignore = config_ignore
 
-        if header_line_index is not None:
-            lines[header_line_index] = new_header
+        self.file_types = file_types
+        self.default_ignore = list(default_ignore or [])
+        self.use_relative = use_relative
+
+        # Extension -> comment prefix, first matching file type wins
+        self._prefixes = {}
+        for config in file_types.values():
+            for ext in config['extensions']:
+                self._prefixes.setdefault(ext, config['comment_prefix'])
+
+        self._ignore = {}
+        self._git_roots = {}
+        self._index = SkipIndex(index_path) if index_path else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._index is not None:
+            self._index.save()
+            self._index.close()
+
+    def comment_prefix(self, file_path):
+        return self._prefixes.get(file_path.suffix.lower())
+
+    def ignore_matcher(self, root_path):
+        if root_path not in self._ignore:
+            patterns = load_headerignore(root_path, extra_patterns=list(self.default_ignore))
+            self._ignore[root_path] = compile_ignore_patterns(tuple(patterns))
+        return self._ignore[root_path]
+
+    def discover(self, root_dir, shard=None):
+        root_path = Path(root_dir).resolve()
+        if not root_path.exists():
+            raise FileNotFoundError(f"{root_path} doesn't exist.")
+
+        files = list(self._walk(root_path, self.ignore_matcher(root_path)))
+        if shard is not None:
+            files = select_shard(files, root_path, shard)
+        return files
+
+    def process(self, root_dir, files=None, journal=None, callback=None):
+        root_path = Path(root_dir).resolve()
+        if files is None:
+            files = self.discover(root_path)
+        # Files without a configured comment prefix are never processed, so
+        # they must not count towards the total or the journal's plan
+        files = [f for f in files if os.path.splitext(str(f))[1].lower() in self._prefixes]
+
+        if journal is not None and not journal.exists():
+            journal.start(files, root_path, self.use_relative)
+
+        jobs = self._iter_jobs(files, self._git_root(root_path))
+        if journal is None:
+            results = (self._process_one(*job) for job in jobs)
         else:
-            # If first line is a shebang, insert after it
-            if lines and lines[0].startswith("#!"):
-                lines.insert(1, new_header)
+            results = self._process_journaled(jobs, journal)
+
+        total = len(files)
+        for done, result in enumerate(results, 1):
+            if callback is not None:
+                callback(result, done, total)
+            yield result
+
+    def run(self, root_dir, files=None, journal=None, callback=None):
+        return list(self.process(root_dir, files=files, journal=journal, callback=callback))
+
+    def renamed_files(self, root_dir, since="HEAD"):
+        # Supported, non-ignored files under root_dir that git reports as
+        # renamed since `since`, or None outside a Git repository
+        root_path = Path(root_dir).resolve()
+        git_root = find_git_root(root_path)
+        if git_root is None:
+            return None
+        renames = find_renamed_files(git_root, since)
+        if renames is None:
+            return None
+
+        matcher = self.ignore_matcher(root_path)
+        files = []
+        for _, new_path in renames:
+            new_path = new_path.resolve()
+            if not new_path.is_relative_to(root_path):
+                continue
+            if os.path.splitext(new_path.name)[1] not in self._prefixes:
+                continue
+            if matcher is not None and should_ignore(new_path, root_path, matcher):
+                continue
+            files.append(new_path)
+        return files
+
+    def strip(self, root_dir, files=None, callback=None):
+        if files is None:
+            files = self.discover(root_dir)
+
+        def remove_header(marker):
+            return lambda line: None if line.startswith(marker) else line
+
+        return self._rewrite_heads(files, remove_header, callback)
+
+    def migrate(self, root_dir, old_prefix, new_prefix, files=None, callback=None):
+        if files is None:
+            files = self.discover(root_dir)
+
+        def move_header(marker):
+            def transform(line):
+                if not line.startswith(marker):
+                    return line
+                header_path = _replace_prefix(line[len(marker):], old_prefix, new_prefix)
+                return line if header_path is None else marker + header_path
+            return transform
+
+        return self._rewrite_heads(files, move_header, callback)
+
+    def _rewrite_heads(self, files, make_transform, callback):
+        files = [f for f in files if self.comment_prefix(f) is not None]
+        transforms = {}
+        total = len(files)
+        for done, file_path in enumerate(files, 1):
+            comment_prefix = self.comment_prefix(file_path)
+            transform = transforms.get(comment_prefix)
+            if transform is None:
+                transform = transforms[comment_prefix] = make_transform(f"{comment_prefix}File: ")
+
+            try:
+                status, new_line = rewrite_header_in_head(file_path, transform)
+                header_path = new_line[len(comment_prefix) + len("File: "):] if new_line else ""
+                result = FileResult(file_path, str(file_path), header_path, status)
+            except Exception as e:
+                result = FileResult(file_path, str(file_path), "", "error", str(e))
+
+            if callback is not None:
+                callback(result, done, total)
+            yield result
+
+    def _git_root(self, root_path):
+        if not self.use_relative:
+            return None
+        if root_path not in self._git_roots:
+            self._git_roots[root_path] = find_git_root(root_path)
+        return self._git_roots[root_path]
+
+    def _walk(self, root_path, matcher):
+        # A single pass over the tree. Ignored directories are pruned, which
+        # is equivalent to should_ignore() since it matches every ancestor.
+        for dirpath, dirnames, filenames in os.walk(root_path):
+            if matcher is not None:
+                rel_dir = os.path.relpath(dirpath, root_path)
+                rel_dir = '' if rel_dir == '.' else os.path.normcase(rel_dir).replace(os.sep, '/') + '/'
+                dirnames[:] = [
+                    d for d in dirnames
+                    if not _ignored_entry(matcher, rel_dir, os.path.normcase(d))
+                ]
+            for name in filenames:
+                if os.path.splitext(name)[1] not in self._prefixes:
+                    continue
+                if matcher is not None and _ignored_entry(matcher, rel_dir, os.path.normcase(name)):
+                    continue
+                yield Path(dirpath, name)
+
+    def _iter_jobs(self, files, git_root):
+        # Header and display prefixes are computed once per directory and
+        # the comment prefix is folded in, so each file costs a concatenation.
+        dir_prefixes = {}
+        for file_path in files:
+            path_str = str(file_path)
+            dir_str, name = os.path.split(path_str)
+            comment_prefix = self._prefixes.get(os.path.splitext(name)[1].lower())
+            if comment_prefix is None:
+                continue
+
+            if os.path.islink(path_str):
+                header_path, display_path = self._header_path(file_path, git_root)
+                yield file_path, display_path, header_path, f"{comment_prefix}File: {header_path}"
+                continue
+
+            prefixes = dir_prefixes.get(dir_str)
+            if prefixes is None:
+                prefixes = dir_prefixes[dir_str] = self._dir_prefixes(dir_str, git_root)
+            header_dir, display_dir, line_prefixes = prefixes
+
+            line_prefix = line_prefixes.get(comment_prefix)
+            if line_prefix is None:
+                line_prefix = line_prefixes[comment_prefix] = sys.intern(f"{comment_prefix}File: {header_dir}")
+
+            header_path = header_dir + name
+            display_path = header_path if display_dir is None else display_dir + name
+            yield file_path, display_path, header_path, line_prefix + name
+
+    def _dir_prefixes(self, dir_str, git_root):
+        # Returns (header prefix, display prefix or None when it equals the
+        # header prefix, per-comment-prefix line cache)
+        resolved_dir = Path(dir_str).resolve()
+        if self.use_relative and git_root:
+            try:
+                rel_dir = str(resolved_dir.relative_to(git_root))
+                header_dir = '' if rel_dir == '.' else rel_dir + os.sep
+                return sys.intern(header_dir), None, {}
+            except ValueError:
+                pass
+        return sys.intern(_with_sep(str(resolved_dir))), _with_sep(dir_str), {}
+
+    def _header_path(self, file_path, git_root):
+        # Determine header path (relative or absolute)
+        try:
+            resolved_path = file_path.resolve()
+            if self.use_relative and git_root:
+                header_path = str(resolved_path.relative_to(git_root))
+                display_path = header_path
             else:
-                lines.insert(0, new_header)
+                header_path = str(resolved_path)
+                display_path = str(file_path)
+        except ValueError:
+            header_path = str(file_path.resolve())
+            display_path = str(file_path)
+        return header_path, display_path
 
-        new_content = "\n".join(lines) + ("\n" if content.endswith("\n") else "")
+    def _process_one(self, file_path, display_path, header_path, header_line):
+        # An index hit means this exact head and size was already seen with
+        # the correct header for this path, so the full read can be skipped.
+        key, size, hit = self._lookup_index(file_path, header_path)
+        if hit:
+            return FileResult(file_path, display_path, header_path, "skipped", size=size)
 
-        if new_content != content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
-            return "written"
-        else:
-            return "skipped"
+        try:
+            status, size = _write_header(file_path, header_line)
+        except Exception as e:
+            return FileResult(file_path, display_path, header_path, "error", str(e))
 
-    except Exception as e:
-        print(f"Error processing {file_path}: {e}")
-        return "error"
+        self._update_index(file_path, header_path, key, status)
+        return FileResult(file_path, display_path, header_path, status, size=size)
+
+    def _process_journaled(self, jobs, journal):
+        batch = []
+        for job in jobs:
+            batch.append(job)
+            if len(batch) == BATCH_SIZE:
+                yield from self._apply_batch(batch, journal)
+                batch = []
+        if batch:
+            yield from self._apply_batch(batch, journal)
+
+    def _apply_batch(self, batch, journal):
+        # Read and plan every file first, make the planned changes durable in
+        # the journal, then write. An interruption leaves at most one batch
+        # to redo.
+        results = {}
+        sizes = {}
+        planned = []
+        for file_path, display_path, header_path, header_line in batch:
+            key, size, hit = self._lookup_index(file_path, header_path)
+            if hit:
+                results[file_path] = ("skipped", None)
+                sizes[file_path] = size
+                continue
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                new_content, change = replace_header_line(content, header_line)
+            except Exception as e:
+                results[file_path] = ("error", str(e))
+                continue
+            sizes[file_path] = len(content.encode('utf-8'))
+            if new_content == content:
+                results[file_path] = ("skipped", None)
+                self._update_index(file_path, header_path, key, "skipped")
+            else:
+                planned.append((file_path, header_path, new_content, change))
+
+        batch_id = journal.record_batch([(file_path, change) for file_path, _, _, change in planned])
+
+        for file_path, header_path, new_content, _ in planned:
+            try:
+                atomic_write(file_path, new_content)
+                results[file_path] = ("written", None)
+                self._update_index(file_path, header_path, None, "written")
+            except Exception as e:
+                results[file_path] = ("error", str(e))
+
+        journal.commit_batch(batch_id, [p for p, (status, _) in results.items() if status != "error"])
+
+        for file_path, display_path, header_path, _ in batch:
+            status, error = results[file_path]
+            yield FileResult(file_path, display_path, header_path, status, error, sizes.get(file_path, 0))
+
+    def _lookup_index(self, file_path, header_path):
+        # Returns the content key (or None), the file size in bytes and
+        # whether the index already has this content for header_path
+        if self._index is None:
+            return None, 0, False
+        try:
+            key, size = content_key_and_size(file_path)
+        except OSError:
+            return None, 0, False
+        return key, size, self._index.contains(key, header_path)
+
+    def _update_index(self, file_path, header_path, key, status):
+        if self._index is None or status == "error":
+            return
+        if status == "written" or key is None:
+            try:
+                key = content_key(file_path)
+            except OSError:
+                return
+        self._index.add(key, header_path)
 
 def find_and_process_files(
     root_dir,
     file_types,
     use_relative=False,
     default_ignore=None,
-    print_written=False
+    print_written=False,
+    index_path=None,
+    journal_path=None,
+    resume=False,
+    show_progress=False,
+    shard=None,
+    results_path=None
 ):
     root_path = Path(root_dir).resolve()
     if not root_path.exists():
         print(f"Error: {root_path} doesn't exist.")
         return
 
-    git_root = find_git_root(root_path) if use_relative else None
-    all_extensions = [ext for config in file_types.values() for ext in config['extensions']]
-    ignore_patterns = load_headerignore(root_path, extra_patterns=default_ignore)
+    journal = Journal(journal_path) if journal_path else None
+    if journal is not None and resume:
+        if not journal.exists():
+            print(f"Error: No run to resume in {journal_path}.")
+            return
+        # Headers must be built the same way as in the interrupted run
+        if journal.root is not None and (Path(journal.root), journal.use_relative) != (root_path, use_relative):
+            root_path = Path(journal.root)
+            use_relative = journal.use_relative
+            print(f"⚠️  Resuming with the journal's settings: root {root_path}, "
+                  f"{'relative' if use_relative else 'absolute'} paths.")
 
-    seen = set()
-    files = []
-    for ext in all_extensions:
-        for p in root_path.rglob(f'*{ext}'):
-            if p not in seen:
-                seen.add(p)
-                files.append(p)
+    headerizer = Headerizer(file_types, default_ignore=default_ignore, use_relative=use_relative, index_path=index_path)
 
-    target_files = [f for f in files if not should_ignore(f, root_path, ignore_patterns)]
+    if journal is not None and resume:
+        # The journal carries the candidate list, so no re-scan is needed
+        target_files = journal.pending()
+    else:
+        if journal is not None and journal.exists():
+            print(f"Error: Journal {journal_path} has an unfinished run. Use --resume or --rollback.")
+            headerizer.close()
+            return
+        target_files = headerizer.discover(root_path, shard=shard)
 
     print(f"Found {len(target_files)} file(s) to process.")
     confirm = input("⚠️  Proceed with header insertion? (y/N): ").strip().lower()
     if confirm != 'y':
         print("❌ Operation canceled.")
+        headerizer.close()
         return
 
-    for file_path in target_files:
-        config = get_file_type_config(file_path, file_types)
-        if not config:
-            continue
-
-        # Determine header path (relative or absolute)
-        try:
-            resolved_path = file_path.resolve()
-            if use_relative and git_root:
-                header_path = str(resolved_path.relative_to(git_root))
-                display_path = header_path
+    reporter = ProgressReporter(len(target_files), print_written=print_written, show_progress=show_progress)
+    results = [] if results_path else None
+    try:
+        for result in headerizer.process(root_path, target_files, journal=journal, callback=reporter):
+            if results is not None:
+                results.append(result)
+        reporter.finish()
+        if results is not None:
+            write_results(results_path, results, root_path, shard)
+        if journal is not None:
+            if reporter.counts["error"]:
+                # Failed files are not committed, so keep the journal to retry them
+                print(f"⚠️  {reporter.counts['error']} file(s) failed. Fix the errors and resume with "
+                      f"--journal {journal_path} --resume, or undo with --rollback.")
             else:
-                header_path = str(resolved_path)
-                display_path = str(file_path)
-        except ValueError:
-            header_path = str(file_path.resolve())
-            display_path = str(file_path)
+                journal.remove()
+    except KeyboardInterrupt:
+        reporter.flush()
+        if journal is None:
+            raise
+        print(f"\n❌ Interrupted. Resume with --journal {journal_path} --resume, or undo with --rollback.")
+        sys.exit(130)
+    finally:
+        if journal is not None:
+            journal.close()
+        headerizer.close()
+
+def strip_headers(
+    root_dir,
+    file_types,
+    default_ignore=None,
+    print_written=False,
+    show_progress=False,
+    shard=None
+):
+    root_path = Path(root_dir).resolve()
+    if not root_path.exists():
+        print(f"Error: {root_path} doesn't exist.")
+        return
+
+    headerizer = Headerizer(file_types, default_ignore=default_ignore)
+    target_files = headerizer.discover(root_path, shard=shard)
+
+    print(f"Found {len(target_files)} file(s) to process.")
+    confirm = input("⚠️  Proceed with header removal? (y/N): ").strip().lower()
+    if confirm != 'y':
+        print("❌ Operation canceled.")
+        return
+
+    reporter = ProgressReporter(
+        len(target_files),
+        print_written=print_written,
+        show_progress=show_progress,
+        written_label="🧹 Removed header from",
+        skipped_label="✅ No header in"
+    )
+    for _ in headerizer.strip(root_path, target_files, callback=reporter):
+        pass
+    reporter.finish()
+
+def migrate_headers(
+    root_dir,
+    file_types,
+    old_prefix,
+    new_prefix,
+    since="HEAD",
+    default_ignore=None,
+    print_written=False,
+    show_progress=False
+):
+    root_path = Path(root_dir).resolve()
+    if not root_path.exists():
+        print(f"Error: {root_path} doesn't exist.")
+        return
+
+    headerizer = Headerizer(file_types, default_ignore=default_ignore)
+    target_files = headerizer.renamed_files(root_path, since)
+    if target_files is None:
+        print("⚠️  Git rename detection unavailable, checking every file.")
+        target_files = headerizer.discover(root_path)
+    elif not target_files:
+        # Moves made with plain mv only show up as renames once staged
+        print(f"⚠️  Git reports no renamed files since {since}. Stage moves with git mv or git add "
+              f"to limit the check to renamed files. Checking every file.")
+        target_files = headerizer.discover(root_path)
+    else:
+        print(f"Found {len(target_files)} renamed file(s) since {since}.")
+
+    confirm = input(f"⚠️  Rewrite headers from {old_prefix} to {new_prefix}? (y/N): ").strip().lower()
+    if confirm != 'y':
+        print("❌ Operation canceled.")
+        return
+
+    reporter = ProgressReporter(
+        len(target_files),
+        print_written=print_written,
+        show_progress=show_progress,
+        written_label="🚚 Migrated header in",
+        skipped_label="✅ Unchanged"
+    )
+    for _ in headerizer.migrate(root_path, old_prefix, new_prefix, target_files, callback=reporter):
+        pass
+    reporter.finish()
+    if target_files and not reporter.counts["written"] and not reporter.counts["error"]:
+        print(f"⚠️  No header path started with {old_prefix}. OLD and NEW must match the paths "
+              f"as written: Git-root-relative if headers were added with -r, otherwise absolute.")
+
+def rollback_run(journal_path):
+    journal = Journal(journal_path)
+    if not journal.exists():
+        print(f"Error: No run to roll back in {journal_path}.")
+        return
+    restored, failed = journal.rollback()
+    print(f"↩️  Restored original headers in {restored} file(s).")
+    if failed:
+        # Restored files are skipped on a retry, so keep the journal for it
+        journal.close()
+        print(f"❌ {failed} file(s) could not be restored. Fix the errors and retry with "
+              f"--journal {journal_path} --rollback.")
+        sys.exit(1)
+    journal.remove()
 
-        result = add_header_to_file(
-            file_path,
-            file_types,
-            header_path,
-            config['comment_prefix']
-        )
+def _with_sep(dir_str):
+    return dir_str if dir_str.endswith(os.sep) else dir_str + os.sep
 
-        if print_written:
-            if result == "written":
-                print(f"📝 Wrote header to: {display_path}")
-            elif result == "skipped":
-                print(f"✅ Already headerized: {display_path}")
+def _ignored_entry(matcher, rel_dir, name):
+    # Ancestors were already checked while walking down to rel_dir
+    return bool(matcher.match(rel_dir + name) or matcher.match(name))
 
+def _replace_prefix(header_path, old_prefix, new_prefix):
+    # Only whole path components match: "src/a" moves "src/a/x.py" but
+    # not "src/ab/x.py"
+    if not header_path.startswith(old_prefix):
+        return None
+    rest = header_path[len(old_prefix):]
+    if rest and not old_prefix.endswith(('/', os.sep)) and rest[0] not in ('/', os.sep):
+        return None
+    return new_prefix + rest
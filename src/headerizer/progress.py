@@ -0,0 +1,116 @@
+# File: src/headerizer/progress.py
+import sys
+import time
+
+class ProgressReporter:
+    def __init__(
+        self,
+        total,
+        print_written=False,
+        show_progress=False,
+        interval=0.25,
+        buffer_lines=512,
+        stream=None,
+        log_stream=None,
+        written_label="📝 Wrote header to",
+        skipped_label="✅ Already headerized"
+    ):
+        self.total = total
+        self.print_written = print_written
+        self.show_progress = show_progress
+        self.interval = interval
+        self.buffer_lines = buffer_lines
+        self.stream = stream if stream is not None else sys.stderr
+        self.log_stream = log_stream if log_stream is not None else sys.stdout
+        self.written_label = written_label
+        self.skipped_label = skipped_label
+
+        self.done = 0
+        self.bytes = 0
+        self.counts = {"written": 0, "skipped": 0, "error": 0}
+        self._lines = []
+        self._start = time.monotonic()
+        self._last_flush = self._start
+        self._drawn = 0
+
+    def __call__(self, result, done, total):
+        self.done = done
+        self.total = total
+        self.counts[result.status] += 1
+        self.bytes += result.size
+
+        line = self._format_result(result)
+        if line is not None:
+            self._lines.append(line)
+
+        # Terminal writes are batched: per-file lines and the status line are
+        # only emitted when the buffer fills or the interval has elapsed.
+        now = time.monotonic()
+        if len(self._lines) >= self.buffer_lines or now - self._last_flush >= self.interval:
+            self.flush(now)
+
+    def flush(self, now=None):
+        if self._lines:
+            self._clear()
+            self.log_stream.write("\n".join(self._lines) + "\n")
+            self.log_stream.flush()
+            self._lines = []
+        if self.show_progress:
+            self._draw(now if now is not None else time.monotonic())
+        self._last_flush = now if now is not None else time.monotonic()
+
+    def finish(self):
+        self.flush()
+        if self.show_progress:
+            self._clear()
+            elapsed = time.monotonic() - self._start
+            self.stream.write(
+                f"✅ Done in {_format_duration(elapsed)}: "
+                f"{self.counts['written']} written, {self.counts['skipped']} skipped, "
+                f"{self.counts['error']} error(s)\n"
+            )
+            self.stream.flush()
+
+    def status_line(self, now=None):
+        elapsed = max((now if now is not None else time.monotonic()) - self._start, 1e-9)
+        rate = self.done / elapsed
+        mb_rate = self.bytes / elapsed / (1024 * 1024)
+        percent = 100.0 * self.done / self.total if self.total else 100.0
+        eta = (self.total - self.done) / rate if rate else 0
+        return (
+            f"[{self.done}/{self.total}] {percent:.1f}% | {rate:.1f} files/s | "
+            f"{mb_rate:.1f} MB/s | ETA {_format_duration(eta)} | "
+            f"{self.counts['written']} written, {self.counts['skipped']} skipped, "
+            f"{self.counts['error']} error(s)"
+        )
+
+    def _format_result(self, result):
+        if result.status == "error":
+            return f"Error processing {result.path}: {result.error}"
+        if self.print_written:
+            if result.status == "written":
+                return f"{self.written_label}: {result.display_path}"
+            elif result.status == "skipped":
+                return f"{self.skipped_label}: {result.display_path}"
+        return None
+
+    def _draw(self, now):
+        line = self.status_line(now)
+        padding = " " * max(self._drawn - len(line), 0)
+        self.stream.write(f"\r{line}{padding}")
+        self.stream.flush()
+        self._drawn = len(line)
+
+    def _clear(self):
+        if self._drawn:
+            self.stream.write("\r" + " " * self._drawn + "\r")
+            self.stream.flush()
+            self._drawn = 0
+
+def _format_duration(seconds):
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
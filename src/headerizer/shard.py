@@ -0,0 +1,87 @@
+# File: src/headerizer/shard.py
+import hashlib
+import json
+
+def parse_shard(spec):
+    # "i/N" with 1 <= i <= N, matching CI job numbering
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}', expected i/N") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{spec}', expected 1 <= i <= N")
+    return index, count
+
+def shard_of(rel_path, count):
+    digest = hashlib.blake2b(rel_path.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % count + 1
+
+def select_shard(files, root_path, shard):
+    # Hash the root-relative POSIX path so every worker agrees on the split
+    # regardless of where the checkout lives.
+    index, count = shard
+    if count == 1:
+        return list(files)
+    return [
+        f for f in files
+        if shard_of(f.relative_to(root_path).as_posix(), count) == index
+    ]
+
+def write_results(results_path, results, root_path, shard=None):
+    # Paths are stored relative to the root, like the shard key, so reports
+    # from workers with different checkout locations merge cleanly
+    counts = {"written": 0, "skipped": 0, "error": 0}
+    records = []
+    for result in results:
+        counts[result.status] += 1
+        records.append({
+            "path": result.path.relative_to(root_path).as_posix(),
+            "header_path": result.header_path,
+            "status": result.status,
+            "error": result.error,
+        })
+
+    data = {
+        "shards": [f"{shard[0]}/{shard[1]}"] if shard else [],
+        "counts": counts,
+        "results": records,
+    }
+    with open(results_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    return data
+
+def merge_results(results_paths):
+    counts = {"written": 0, "skipped": 0, "error": 0}
+    shards = []
+    records = []
+    for results_path in results_paths:
+        with open(results_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        shards.extend(parse_shard(s) for s in data.get('shards', []))
+        records.extend(data.get('results', []))
+        for status, count in data.get('counts', {}).items():
+            counts[status] = counts.get(status, 0) + count
+
+    if len({count for _, count in shards}) > 1:
+        raise ValueError("Cannot merge results from different shard counts")
+    if len(set(shards)) != len(shards):
+        raise ValueError("Results contain the same shard more than once")
+
+    missing = []
+    if shards:
+        count = shards[0][1]
+        missing = [f"{i}/{count}" for i in range(1, count + 1) if (i, count) not in shards]
+
+    records.sort(key=lambda r: r['path'])
+    return {
+        "shards": [f"{i}/{n}" for i, n in sorted(shards)],
+        "missing": missing,
+        "counts": counts,
+        "results": records,
+    }
+
+def merge_result_files(output_path, results_paths):
+    merged = merge_results(results_paths)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(merged, f, indent=2)
+    return merged
@@ -1,6 +1,11 @@
 # File: src/headerizer/utils.py
 import subprocess
 import fnmatch
+import functools
+import os
+import re
+import shutil
+import tempfile
 from pathlib import Path
 
 def find_git_root(start_path="."):
@@ -13,6 +18,50 @@ def find_git_root(start_path="."):
     except (subprocess.CalledProcessError, FileNotFoundError):
         return None
     
+def atomic_write(file_path, content, newline=None):
+    # Write beside the target and swap it in, so a failed write (disk full,
+    # Ctrl-C) leaves the original file intact instead of truncated
+    target = os.path.realpath(file_path)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(target), prefix=f".{os.path.basename(target)}.", suffix='.tmp'
+    )
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline=newline) as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(target, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def find_renamed_files(git_root, since="HEAD"):
+    # (old, new) paths of files renamed between `since` and the working tree
+    try:
+        result = subprocess.run(
+            ['git', 'diff', '--name-status', '-M', '-z', since],
+            capture_output=True, text=True, cwd=git_root, check=True
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+    tokens = result.stdout.split('\0')
+    renames = []
+    i = 0
+    while i < len(tokens) and tokens[i]:
+        status = tokens[i]
+        if status[0] in 'RC':
+            if status[0] == 'R':
+                renames.append((Path(git_root) / tokens[i + 1], Path(git_root) / tokens[i + 2]))
+            i += 3
+        else:
+            i += 2
+    return renames
+
 def load_headerignore(root_dir, extra_patterns=None):
     headerignore_path = root_dir / '.headerignore'
     patterns = extra_patterns or []
@@ -29,22 +78,33 @@ def load_headerignore(root_dir, extra_patterns=None):
 
     return patterns
 
+@functools.lru_cache(maxsize=32)
+def compile_ignore_patterns(patterns):
+    # One alternation regex equivalent to fnmatch against every pattern
+    if not patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
+
 def should_ignore(file_path, root_dir, ignore_patterns):
     if not ignore_patterns:
         return False
 
+    if isinstance(ignore_patterns, re.Pattern):
+        matcher = ignore_patterns
+    else:
+        matcher = compile_ignore_patterns(tuple(ignore_patterns))
+
     try:
         rel_path = file_path.relative_to(root_dir)
-        rel_path_str = str(rel_path)
-        path_parts = rel_path.parts
+        rel_path_str = os.path.normcase(str(rel_path))
+        path_parts = [os.path.normcase(part) for part in rel_path.parts]
 
-        for pattern in ignore_patterns:
-            if fnmatch.fnmatch(rel_path_str, pattern):
+        if matcher.match(rel_path_str):
+            return True
+        for i in range(len(path_parts)):
+            partial_path = '/'.join(path_parts[:i+1])
+            if matcher.match(partial_path) or matcher.match(path_parts[i]):
                 return True
-            for i in range(len(path_parts)):
-                partial_path = '/'.join(path_parts[:i+1])
-                if fnmatch.fnmatch(partial_path, pattern) or fnmatch.fnmatch(path_parts[i], pattern):
-                    return True
 
     except ValueError:
         return False
@@ -0,0 +1,34 @@
+# File: tests/unit/conftest.py
+import copy
+import pytest
+
+FILE_TYPES = {
+    'python': {
+        'extensions': ['.py'],
+        'comment_prefix': '# '
+    },
+    'javascript': {
+        'extensions': ['.js', '.jsx'],
+        'comment_prefix': '// '
+    },
+    'r': {
+        'extensions': ['.r', '.R'],
+        'comment_prefix': '# '
+    }
+}
+
+@pytest.fixture
+def file_types():
+    """File type configuration shared by the processing tests"""
+    return copy.deepcopy(FILE_TYPES)
+
+@pytest.fixture
+def make_project():
+    """Return a helper that writes {relative path: content} under a root directory"""
+    def make(root, files):
+        for rel, content in files.items():
+            path = root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        return root
+    return make
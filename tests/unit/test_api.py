@@ -0,0 +1,104 @@
+# File: tests/unit/test_api.py
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+from headerizer import Headerizer, FileResult
+from headerizer.journal import Journal
+
+class TestHeaderizerApi:
+    """Test the programmatic Headerizer API"""
+
+    def _make_project(self, make_project, tmpdir_path):
+        project = tmpdir_path / "project"
+        return make_project(project, {
+            "src/main.py": "print('main')\n",
+            "src/app.js": "# File: ignored.py\n",
+            "src/done.py": f"# File: {(project / 'src' / 'done.py').resolve()}\n",
+            "build/out.js": "bundle()\n",
+            "notes.txt": "not source\n",
+        })
+
+    @patch("builtins.print")
+    def test_run_returns_typed_results_without_printing(self, mock_print, file_types, make_project):
+        """Test that run yields result records and has no print side-effects"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project = self._make_project(make_project, Path(tmpdir))
+
+            headerizer = Headerizer(file_types, default_ignore=["build"])
+            results = headerizer.run(project)
+
+            assert all(isinstance(r, FileResult) for r in results)
+            statuses = {r.path.name: r.status for r in results}
+            assert statuses == {"main.py": "written", "app.js": "written", "done.py": "skipped"}
+            assert (project / "src" / "app.js").read_text().startswith("// File: ")
+            mock_print.assert_not_called()
+
+    def test_callback_reports_progress(self, file_types, make_project):
+        """Test that the callback receives each result with running counts"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project = self._make_project(make_project, Path(tmpdir))
+            calls = []
+
+            headerizer = Headerizer(file_types, default_ignore=["build"])
+            results = list(headerizer.process(project, callback=lambda r, done, total: calls.append((r, done, total))))
+
+            assert [c[0] for c in calls] == results
+            assert [c[1] for c in calls] == [1, 2, 3]
+            assert all(c[2] == 3 for c in calls)
+
+    def test_unsupported_files_are_not_counted(self, file_types, make_project):
+        """Test that explicitly passed files without a comment prefix are dropped up front"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            project = self._make_project(make_project, tmpdir_path)
+            files = [project / "src" / "main.py", project / "notes.txt"]
+            journal = Journal(tmpdir_path / "journal")
+            calls = []
+
+            headerizer = Headerizer(file_types)
+            headerizer.run(project, files=files, journal=journal, callback=lambda r, done, total: calls.append((done, total)))
+            journal.close()
+
+            assert calls == [(1, 1)]
+            assert journal.plan == [str(project / "src" / "main.py")]
+            assert journal.pending() == []
+
+    def test_result_size_is_in_bytes(self, file_types):
+        """Test that sizes count encoded bytes, not characters"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "greek.py"
+            path.write_text("name = 'αβγ'\n", encoding='utf-8')
+            size = path.stat().st_size
+
+            results = Headerizer(file_types).run(tmpdir)
+
+            assert results[0].size == size
+            assert size > len("name = 'αβγ'\n")
+
+    def test_errors_are_reported_in_results(self, file_types, make_project):
+        """Test that failures are captured as error records instead of raised"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project = self._make_project(make_project, Path(tmpdir))
+
+            headerizer = Headerizer(file_types, default_ignore=["build"])
+            with patch("builtins.open", side_effect=IOError("Permission denied")):
+                results = headerizer.run(project)
+
+            assert all(r.status == "error" for r in results)
+            assert all(r.error == "Permission denied" for r in results)
+
+    def test_discover_is_reusable_across_roots(self, file_types, make_project):
+        """Test that one instance can discover in several directories"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            project = self._make_project(make_project, tmpdir_path)
+            other = tmpdir_path / "other"
+            other.mkdir()
+            (other / "build.py").write_text("x = 1\n")
+            (other / ".headerignore").write_text("*.py\n")
+
+            headerizer = Headerizer(file_types, default_ignore=["build"])
+            assert {p.name for p in headerizer.discover(project)} == {"main.py", "app.js", "done.py"}
+            assert headerizer.discover(other) == []
+            assert headerizer.default_ignore == ["build"]
+            assert {p.name for p in headerizer.discover(project)} == {"main.py", "app.js", "done.py"}
@@ -0,0 +1,89 @@
+# File: tests/unit/test_discovery.py
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from headerizer.processor import Headerizer
+from headerizer.utils import should_ignore, load_headerignore, get_file_type_config
+
+IGNORE = ["build", "*.min.js", "vendor/legacy"]
+
+class TestDiscovery:
+    """Test the single-pass walker and per-directory header prefixes"""
+
+    def _make_tree(self, root, make_project):
+        paths = [
+            "a.py", "b.js", "c.min.js", "notes.txt", "stats.R", ".py",
+            "src/app.jsx", "src/deep/er/mod.py", "src/deep/er/util.js",
+            "build/out.js", "src/build/gen.py",
+            "vendor/legacy/old.js", "vendor/new.js",
+        ]
+        make_project(root, {rel: "x\n" for rel in paths})
+        (root / "src" / "link.py").symlink_to(root / "src" / "deep" / "er" / "mod.py")
+        return root
+
+    def _reference_discover(self, root, file_types):
+        """The previous rglob-per-extension discovery, less files it never processed."""
+        patterns = load_headerignore(root, extra_patterns=list(IGNORE))
+        seen = set()
+        files = []
+        for config in file_types.values():
+            for ext in config['extensions']:
+                for p in root.rglob(f'*{ext}'):
+                    if p not in seen:
+                        seen.add(p)
+                        files.append(p)
+        return [
+            f for f in files
+            if not should_ignore(f, root, patterns) and get_file_type_config(f, file_types)
+        ]
+
+    def test_walker_matches_rglob_discovery(self, file_types, make_project):
+        """Test that the walker finds the same files as per-extension rglob"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = self._make_tree(Path(tmpdir).resolve(), make_project)
+            (root / ".headerignore").write_text("src/deep/er/util.js\n")
+
+            found = Headerizer(file_types, default_ignore=IGNORE).discover(root)
+            assert sorted(found) == sorted(self._reference_discover(root, file_types))
+            assert root / "vendor" / "new.js" in found
+            assert root / "stats.R" in found
+
+    def _assert_headers_match(self, headerizer, root, git_root):
+        files = headerizer.discover(root)
+        jobs = list(headerizer._iter_jobs(files, git_root))
+        assert len(jobs) == len(files)
+        for file_path, display_path, header_path, header_line in jobs:
+            expected_header, expected_display = headerizer._header_path(file_path, git_root)
+            prefix = headerizer._prefixes[os.path.splitext(file_path.name)[1].lower()]
+            assert header_path == expected_header
+            assert display_path == expected_display
+            assert header_line == f"{prefix}File: {expected_header}"
+
+    def test_absolute_headers_match_per_file_resolution(self, file_types, make_project):
+        """Test cached prefixes against resolving every file"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = self._make_tree(Path(tmpdir).resolve(), make_project)
+            self._assert_headers_match(Headerizer(file_types, default_ignore=IGNORE), root, None)
+
+    def test_relative_headers_match_per_file_resolution(self, file_types, make_project):
+        """Test cached relative prefixes, including files at the Git root"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = self._make_tree(Path(tmpdir).resolve(), make_project)
+            subprocess.run(['git', 'init'], check=True, capture_output=True, cwd=root)
+
+            headerizer = Headerizer(file_types, default_ignore=IGNORE, use_relative=True)
+            self._assert_headers_match(headerizer, root, root)
+            self._assert_headers_match(headerizer, root / "src", root)
+
+            jobs = {j[0].name: j for j in headerizer._iter_jobs(headerizer.discover(root), root)}
+            assert jobs["a.py"][2] == "a.py"
+            assert jobs["mod.py"][3] == f"# File: {os.path.join('src', 'deep', 'er', 'mod.py')}"
+            assert jobs["link.py"][2] == os.path.join('src', 'deep', 'er', 'mod.py')
+
+    def test_relative_headers_outside_git_root_fall_back(self, file_types, make_project):
+        """Test that directories outside the Git root use absolute headers"""
+        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as other:
+            root = self._make_tree(Path(tmpdir).resolve(), make_project)
+            headerizer = Headerizer(file_types, default_ignore=IGNORE, use_relative=True)
+            self._assert_headers_match(headerizer, root, Path(other).resolve())
@@ -0,0 +1,197 @@
+# File: tests/unit/test_journal.py
+import errno
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from headerizer.journal import Journal
+from headerizer.processor import Headerizer, find_and_process_files, rollback_run
+
+ORIGINALS = {
+    "a.py": "print('a')\n",
+    "b.py": "# File: old/b.py\nprint('b')\n",
+    "c.py": "#!/usr/bin/env python\nprint('c')\n",
+    "d.py": "print('d')",
+    "e.py": "print('e')\n",
+}
+
+class TestJournal:
+    """Test journaled batch processing, resume and rollback"""
+
+    def _interrupted_run(self, project, journal_path, file_types, use_relative=False):
+        """Run with batches of two and interrupt before the second commit."""
+        real_commit = Journal.commit_batch
+        calls = []
+
+        def commit_then_interrupt(journal, batch, paths):
+            calls.append(batch)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            real_commit(journal, batch, paths)
+
+        with patch("headerizer.processor.BATCH_SIZE", 2), \
+                patch.object(Journal, "commit_batch", commit_then_interrupt), \
+                pytest.raises(SystemExit) as exit_info:
+            find_and_process_files(project, file_types, journal_path=journal_path, use_relative=use_relative)
+        assert exit_info.value.code == 130
+
+    @patch("builtins.input", return_value="y")
+    @patch("builtins.print")
+    def test_completed_run_removes_journal(self, mock_print, mock_input, file_types, make_project):
+        """Test that a finished journaled run writes headers and cleans up"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            project = make_project(tmpdir_path / "project", ORIGINALS)
+            journal_path = tmpdir_path / "journal"
+
+            find_and_process_files(project, file_types, journal_path=journal_path)
+
+            assert not journal_path.exists()
+            for name in ORIGINALS:
+                assert f"# File: {project / name}" in (project / name).read_text()
+
+    @patch("builtins.input", return_value="y")
+    @patch("builtins.print")
+    def test_resume_finishes_without_rescan(self, mock_print, mock_input, file_types, make_project):
+        """Test that resuming processes the remaining files from the journal"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            project = make_project(tmpdir_path / "project", ORIGINALS)
+            journal_path = tmpdir_path / "journal"
+
+            self._interrupted_run(project, journal_path, file_types)
+            assert journal_path.exists()
+            journal = Journal(journal_path)
+            assert len(journal.pending()) == 3
+
+            # A fresh run must not silently clobber the unfinished one
+            find_and_process_files(project, file_types, journal_path=journal_path)
+            assert any("unfinished run" in call.args[0] for call in mock_print.call_args_list)
+
+            with patch.object(Headerizer, "discover") as mock_discover:
+                find_and_process_files(project, file_types, journal_path=journal_path, resume=True)
+                mock_discover.assert_not_called()
+
+            assert not journal_path.exists()
+            for name in ORIGINALS:
+                assert f"# File: {project / name}" in (project / name).read_text()
+
+    @patch("builtins.input", return_value="y")
+    @patch("builtins.print")
+    def test_resume_uses_recorded_settings(self, mock_print, mock_input, file_types, make_project):
+        """Test that resuming keeps the header style of the interrupted run"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            project = make_project(tmpdir_path / "project", ORIGINALS)
+            journal_path = tmpdir_path / "journal"
+
+            with patch("headerizer.processor.find_git_root", return_value=project):
+                self._interrupted_run(project, journal_path, file_types, use_relative=True)
+            journal = Journal(journal_path)
+            assert journal.use_relative is True
+            assert journal.root == str(project.resolve())
+
+            # Resumed from elsewhere and without -r
+            with patch("headerizer.processor.find_git_root", return_value=project):
+                find_and_process_files(tmpdir_path, file_types, journal_path=journal_path, resume=True)
+
+            for name in ORIGINALS:
+                assert f"# File: {name}\n" in (project / name).read_text()
+
+    @patch("builtins.input", return_value="y")
+    @patch("builtins.print")
+    def test_rollback_restores_originals(self, mock_print, mock_input, file_types, make_project):
+        """Test that rollback restores every file touched by an interrupted run"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            project = make_project(tmpdir_path / "project", ORIGINALS)
+            journal_path = tmpdir_path / "journal"
+
+            self._interrupted_run(project, journal_path, file_types)
+            assert any(
+                (project / name).read_text() != content for name, content in ORIGINALS.items()
+            )
+
+            rollback_run(journal_path)
+
+            assert not journal_path.exists()
+            for name, content in ORIGINALS.items():
+                assert (project / name).read_text() == content
+
+    @patch("builtins.input", return_value="y")
+    @patch("builtins.print")
+    def test_failed_rollback_keeps_journal(self, mock_print, mock_input, file_types, make_project):
+        """Test that a rollback with failed restores can be retried"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            project = make_project(tmpdir_path / "project", ORIGINALS)
+            journal_path = tmpdir_path / "journal"
+            self._interrupted_run(project, journal_path, file_types)
+
+            def full_disk_write(*args, **kwargs):
+                raise OSError(errno.ENOSPC, "No space left on device")
+
+            with patch("headerizer.journal.atomic_write", full_disk_write), \
+                    pytest.raises(SystemExit) as exit_info:
+                rollback_run(journal_path)
+            assert exit_info.value.code == 1
+            assert journal_path.exists()
+
+            # Undecodable content counts as a failure instead of aborting
+            changed = next(n for n, c in ORIGINALS.items() if (project / n).read_text() != c)
+            real_content = (project / changed).read_bytes()
+            (project / changed).write_bytes(b"\xff\xfe" + real_content)
+            with pytest.raises(SystemExit):
+                rollback_run(journal_path)
+            assert journal_path.exists()
+
+            (project / changed).write_bytes(real_content)
+            rollback_run(journal_path)
+            assert not journal_path.exists()
+            for name, content in ORIGINALS.items():
+                assert (project / name).read_text() == content
+
+    @patch("builtins.print")
+    def test_torn_final_line_is_ignored(self, mock_print):
+        """Test that a partially written last record does not break loading"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            journal_path = Path(tmpdir) / "journal"
+            journal_path.write_text('{"plan": ["/x/a.py", "/x/b.py"]}\n{"commit": 1, "paths": ["/x/a.py"]}\n{"batch": 2, "pa')
+
+            journal = Journal(journal_path)
+            assert journal.exists()
+            assert journal.pending() == [Path("/x/b.py")]
+
+    @patch("builtins.input", return_value="y")
+    @patch("builtins.print")
+    def test_failed_write_leaves_original_intact(self, mock_print, mock_input, capsys, file_types, make_project):
+        """Test that a disk-full error during a batch does not truncate files"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            project = make_project(tmpdir_path / "project", ORIGINALS)
+            journal_path = tmpdir_path / "journal"
+            real_fdopen = os.fdopen
+
+            def full_disk_fdopen(*args, **kwargs):
+                f = real_fdopen(*args, **kwargs)
+                def write(data):
+                    raise OSError(errno.ENOSPC, "No space left on device")
+                f.write = write
+                return f
+
+            with patch("headerizer.utils.os.fdopen", full_disk_fdopen):
+                find_and_process_files(project, file_types, journal_path=journal_path)
+
+            for name, content in ORIGINALS.items():
+                assert (project / name).read_text() == content
+            assert sorted(p.name for p in project.iterdir()) == sorted(ORIGINALS)
+
+            # The failed files stay pending and can be resumed once fixed
+            assert journal_path.exists()
+            assert any("resume" in call.args[0] for call in mock_print.call_args_list)
+            find_and_process_files(project, file_types, journal_path=journal_path, resume=True)
+            assert not journal_path.exists()
+            for name in ORIGINALS:
+                assert f"# File: {project / name}" in (project / name).read_text()
+            assert "No space left on device" in capsys.readouterr().out
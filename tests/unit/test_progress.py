@@ -0,0 +1,71 @@
+# File: tests/unit/test_progress.py
+import io
+from pathlib import Path
+from headerizer.processor import FileResult
+from headerizer.progress import ProgressReporter
+
+def _result(name, status, error=None, size=1024):
+    return FileResult(Path(name), name, name, status, error, size)
+
+class TestProgressReporter:
+    """Test buffered logging and progress reporting"""
+
+    def _reporter(self, total, **kwargs):
+        stream = io.StringIO()
+        log_stream = io.StringIO()
+        reporter = ProgressReporter(total, stream=stream, log_stream=log_stream, interval=3600, **kwargs)
+        return reporter, stream, log_stream
+
+    def test_lines_are_buffered_until_full(self):
+        """Test that per-file lines are written in batches"""
+        reporter, _, log_stream = self._reporter(5, print_written=True, buffer_lines=3)
+
+        reporter(_result("a.py", "written"), 1, 5)
+        reporter(_result("b.py", "skipped"), 2, 5)
+        assert log_stream.getvalue() == ""
+
+        reporter(_result("c.py", "written"), 3, 5)
+        assert log_stream.getvalue() == (
+            "📝 Wrote header to: a.py\n"
+            "✅ Already headerized: b.py\n"
+            "📝 Wrote header to: c.py\n"
+        )
+
+        reporter(_result("d.py", "written"), 4, 5)
+        reporter.finish()
+        assert log_stream.getvalue().endswith("📝 Wrote header to: d.py\n")
+
+    def test_errors_are_logged_without_print_flag(self):
+        """Test that errors are always reported but other lines are not"""
+        reporter, _, log_stream = self._reporter(2)
+
+        reporter(_result("a.py", "written"), 1, 2)
+        reporter(_result("b.py", "error", "Permission denied"), 2, 2)
+        reporter.finish()
+
+        assert log_stream.getvalue() == "Error processing b.py: Permission denied\n"
+
+    def test_status_line_contents(self):
+        """Test that the status line reports rates, ETA and counts"""
+        reporter, stream, _ = self._reporter(4, show_progress=True)
+
+        reporter(_result("a.py", "written"), 1, 4)
+        reporter(_result("b.py", "skipped"), 2, 4)
+        reporter(_result("c.py", "error", "boom"), 3, 4)
+        line = reporter.status_line(reporter._start + 2)
+
+        assert line.startswith("[3/4] 75.0%")
+        assert "1.5 files/s" in line
+        assert "MB/s" in line
+        assert "ETA 0s" in line
+        assert "1 written, 1 skipped, 1 error(s)" in line
+
+        reporter.finish()
+        assert "Done in" in stream.getvalue()
+
+    def test_no_progress_output_when_disabled(self):
+        """Test that nothing is drawn unless progress is enabled"""
+        reporter, stream, _ = self._reporter(1)
+        reporter(_result("a.py", "written"), 1, 1)
+        reporter.finish()
+        assert stream.getvalue() == ""
@@ -0,0 +1,97 @@
+# File: tests/unit/test_sharding.py
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from headerizer.cli import cli
+from headerizer.processor import Headerizer, find_and_process_files
+from headerizer.shard import parse_shard, select_shard, merge_results
+
+class TestSharding:
+    """Test partitioning a run across CI workers"""
+
+    def _modules(self, count=40):
+        return {f"pkg{i % 4}/mod{i}.py": f"x = {i}\n" for i in range(count)}
+
+    def test_parse_shard(self):
+        """Test parsing valid and invalid shard specs"""
+        assert parse_shard("1/3") == (1, 3)
+        assert parse_shard("3/3") == (3, 3)
+        for spec in ["0/3", "4/3", "1/0", "a/b", "1", "1/2/3"]:
+            with pytest.raises(ValueError):
+                parse_shard(spec)
+
+    def test_shards_partition_the_candidates(self, file_types, make_project):
+        """Test that every file lands in exactly one shard"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = make_project(Path(tmpdir), self._modules())
+            headerizer = Headerizer(file_types)
+            files = headerizer.discover(root)
+
+            shards = [headerizer.discover(root, shard=(i, 3)) for i in range(1, 4)]
+            combined = [f for shard in shards for f in shard]
+            assert sorted(combined) == sorted(files)
+            assert len(set(combined)) == len(combined)
+            assert all(shards)
+
+    def test_partition_is_independent_of_checkout_location(self, file_types, make_project):
+        """Test that workers with different checkout paths agree"""
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            roots = [make_project(Path(first), self._modules()), make_project(Path(second), self._modules())]
+            selected = []
+            for root in roots:
+                files = sorted(Headerizer(file_types).discover(root))
+                selected.append([f.relative_to(root) for f in select_shard(files, root, (2, 5))])
+            assert selected[0] == selected[1]
+
+    @patch("builtins.input", return_value="y")
+    @patch("builtins.print")
+    def test_shard_results_merge(self, mock_print, mock_input, file_types, make_project):
+        """Test that per-shard results merge into one complete report"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            # Each worker has its own checkout location
+            results_paths = []
+            for i in (1, 2):
+                checkout = make_project(tmpdir_path / f"worker{i}", self._modules(12))
+                results_path = tmpdir_path / f"shard{i}.json"
+                find_and_process_files(checkout, file_types, shard=(i, 2), results_path=results_path)
+                results_paths.append(results_path)
+
+            data = json.loads(results_paths[0].read_text())
+            assert data["shards"] == ["1/2"]
+
+            merged = merge_results(results_paths)
+            assert merged["shards"] == ["1/2", "2/2"]
+            assert merged["missing"] == []
+            assert merged["counts"]["written"] == 12
+            paths = [r["path"] for r in merged["results"]]
+            assert len(set(paths)) == 12
+            assert paths == sorted(paths)
+            assert all(p.startswith("pkg") for p in paths)
+
+            partial = merge_results(results_paths[:1])
+            assert partial["missing"] == ["2/2"]
+
+    def test_merge_rejects_mismatched_shards(self):
+        """Test that inconsistent shard sets are refused"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            for name, shard in [("a", "1/2"), ("b", "1/3"), ("c", "1/2")]:
+                (tmpdir_path / f"{name}.json").write_text(json.dumps({"shards": [shard], "counts": {}, "results": []}))
+
+            with pytest.raises(ValueError):
+                merge_results([tmpdir_path / "a.json", tmpdir_path / "b.json"])
+            with pytest.raises(ValueError):
+                merge_results([tmpdir_path / "a.json", tmpdir_path / "c.json"])
+
+    @patch("builtins.print")
+    def test_cli_rejects_results_with_resume(self, mock_print):
+        """Test that a resumed run cannot write a partial results file"""
+        with patch("sys.argv", ["headerizer", "--journal", "j", "--resume", "--results", "r.json"]), \
+                patch("headerizer.cli.find_and_process_files") as mock_process, \
+                pytest.raises(SystemExit):
+            cli()
+        mock_process.assert_not_called()
+        assert "cannot be combined" in mock_print.call_args.args[0]
@@ -0,0 +1,176 @@
+# File: tests/unit/test_skip_index.py
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+from headerizer.index import SkipIndex, content_key, MAGIC, RECORD_SIZE
+from headerizer.journal import Journal
+from headerizer.processor import Headerizer, find_and_process_files, replace_header_line
+
+class TestSkipIndex:
+    """Test the content-hash skip index"""
+
+    def test_save_and_lookup(self):
+        """Test that saved entries are found after reloading"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            source = tmpdir_path / "a.py"
+            source.write_text("# File: a.py\nprint('a')\n")
+            index_path = tmpdir_path / "index.bin"
+
+            index = SkipIndex(index_path)
+            key = content_key(source)
+            index.add(key, "a.py")
+            index.save()
+            index.close()
+
+            data = index_path.read_bytes()
+            assert data.startswith(MAGIC)
+            assert len(data) == len(MAGIC) + RECORD_SIZE
+
+            index = SkipIndex(index_path)
+            assert index.contains(key, "a.py")
+            assert not index.contains(key, "b.py")
+            index.close()
+
+    def test_records_are_sorted_and_merged(self):
+        """Test that saving keeps hit and added entries in sorted order"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index_path = Path(tmpdir) / "index.bin"
+
+            index = SkipIndex(index_path)
+            for i in range(10):
+                index.add(bytes([i]) * 16, f"file{i}.py")
+            index.save()
+            for i in range(10):
+                assert index.contains(bytes([i]) * 16, f"file{i}.py")
+            index.add(b"\xff" * 16, "last.py")
+            index.save()
+            index.close()
+
+            data = index_path.read_bytes()[len(MAGIC):]
+            records = [data[i:i + RECORD_SIZE] for i in range(0, len(data), RECORD_SIZE)]
+            assert len(records) == 11
+            assert records == sorted(records)
+
+            index = SkipIndex(index_path)
+            for i in range(10):
+                assert index.contains(bytes([i]) * 16, f"file{i}.py")
+            assert index.contains(b"\xff" * 16, "last.py")
+            index.close()
+
+    def test_stale_entries_are_pruned(self):
+        """Test that only entries for visited paths with new content are dropped"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index_path = Path(tmpdir) / "index.bin"
+
+            index = SkipIndex(index_path)
+            index.add(b"\x01" * 16, "kept.py")
+            index.add(b"\x02" * 16, "edited.py")
+            index.add(b"\x03" * 16, "elsewhere.py")
+            index.save()
+            index.close()
+
+            # A run that sees kept.py unchanged and edited.py with new content
+            index = SkipIndex(index_path)
+            assert index.contains(b"\x01" * 16, "kept.py")
+            assert not index.contains(b"\x04" * 16, "edited.py")
+            index.add(b"\x04" * 16, "edited.py")
+            index.save()
+            index.close()
+
+            index = SkipIndex(index_path)
+            assert len(index) == 3
+            assert index.contains(b"\x01" * 16, "kept.py")
+            assert index.contains(b"\x04" * 16, "edited.py")
+            assert not index.contains(b"\x02" * 16, "edited.py")
+            assert index.contains(b"\x03" * 16, "elsewhere.py")
+            index.close()
+
+            # A run that looks nothing up leaves the index untouched
+            mtime = index_path.stat().st_mtime_ns
+            SkipIndex(index_path).save()
+            assert index_path.stat().st_mtime_ns == mtime
+
+    def test_content_change_invalidates_entry(self):
+        """Test that edited files no longer match their index entry"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = Path(tmpdir) / "a.py"
+            source.write_text("# File: a.py\nprint('a')\n")
+            before = content_key(source)
+            source.write_text("# File: a.py\nprint('b')\n")
+            assert content_key(source) != before
+
+    @patch("builtins.print")
+    def test_invalid_index_is_ignored(self, mock_print):
+        """Test that a corrupt index is treated as empty"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index_path = Path(tmpdir) / "index.bin"
+            index_path.write_bytes(b"not an index at all")
+
+            index = SkipIndex(index_path)
+            assert len(index) == 0
+            assert not index.contains(b"\x00" * 16, "a.py")
+            assert any("Warning" in call.args[0] for call in mock_print.call_args_list)
+
+    @patch("builtins.input", return_value="y")
+    @patch("builtins.print")
+    def test_processing_skips_indexed_files(self, mock_print, mock_input, file_types, make_project):
+        """Test that a second run skips files recorded in the index"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            project = make_project(tmpdir_path / "project", {"a.py": "print('a')\n", "b.py": "print('b')\n"})
+            index_path = tmpdir_path / "index.bin"
+
+            find_and_process_files(project, file_types, index_path=index_path)
+            assert (project / "a.py").read_text().startswith("# File: ")
+            index = SkipIndex(index_path)
+            assert len(index) == 2
+            index.close()
+
+            with patch("headerizer.processor.replace_header_line") as mock_build:
+                find_and_process_files(project, file_types, index_path=index_path)
+                mock_build.assert_not_called()
+
+            (project / "b.py").write_text("print('changed')\n")
+            with patch("headerizer.processor.replace_header_line", wraps=replace_header_line) as mock_build:
+                find_and_process_files(project, file_types, index_path=index_path)
+                assert mock_build.call_count == 1
+                assert mock_build.call_args.args[0] == "print('changed')\n"
+
+    def test_index_hits_report_file_size(self, file_types, make_project):
+        """Test that files skipped through the index still report their size"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            project = make_project(tmpdir_path / "project", {"a.py": "print('a')\n"})
+            index_path = tmpdir_path / "index.bin"
+
+            with Headerizer(file_types, index_path=index_path) as headerizer:
+                headerizer.run(project)
+            size = (project / "a.py").stat().st_size
+
+            journal = Journal(tmpdir_path / "journal")
+            with Headerizer(file_types, index_path=index_path) as headerizer:
+                results = headerizer.run(project)
+                journaled = headerizer.run(project, journal=journal)
+            journal.close()
+
+            assert [(r.status, r.size) for r in results + journaled] == [("skipped", size)] * 2
+
+    @patch("builtins.input", return_value="y")
+    @patch("builtins.print")
+    def test_partial_runs_keep_other_entries(self, mock_print, mock_input, file_types, make_project):
+        """Test that indexing a subdirectory or a shard keeps the rest of the index"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            project = make_project(tmpdir_path / "project", {
+                rel: f"print('{rel}')\n" for rel in ["a.py", "b.py", "sub/c.py", "sub/d.py", "sub/e.py", "f.py"]
+            })
+            index_path = tmpdir_path / "index.bin"
+
+            find_and_process_files(project, file_types, index_path=index_path)
+            find_and_process_files(project / "sub", file_types, index_path=index_path)
+            find_and_process_files(project, file_types, index_path=index_path, shard=(1, 2))
+
+            index = SkipIndex(index_path)
+            assert len(index) == 6
+            index.close()
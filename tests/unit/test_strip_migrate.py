@@ -0,0 +1,212 @@
+# File: tests/unit/test_strip_migrate.py
+import errno
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from headerizer.cli import cli
+from headerizer.processor import Headerizer, rewrite_header_in_head, migrate_headers
+from headerizer.utils import find_renamed_files
+
+class TestStripAndMigrate:
+    """Test header removal and path migration"""
+
+    def _git(self, repo, *args):
+        subprocess.run(['git', *args], check=True, capture_output=True, cwd=repo)
+
+    def _make_repo(self, repo, file_types, make_project):
+        repo.mkdir(parents=True)
+        self._git(repo, 'init')
+        self._git(repo, 'config', 'user.email', 'test@example.com')
+        self._git(repo, 'config', 'user.name', 'Test User')
+        make_project(repo, {
+            rel: f"print('{rel}')\n" * 20 for rel in ["old/pkg/a.py", "old/pkg/b.js", "old/other.py", "keep/c.py"]
+        })
+        Headerizer(file_types, use_relative=True).run(repo)
+        self._git(repo, 'add', '-A')
+        self._git(repo, 'commit', '-m', 'Initial commit')
+        return repo
+
+    def test_strip_removes_only_headers(self, file_types):
+        """Test that stripping preserves shebangs, line endings and other lines"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "a.py").write_bytes(b"#!/usr/bin/env python\r\n# File: a.py\r\nprint('a')\r\n")
+            (root / "b.js").write_text("// File: b.js\nrun()")
+            (root / "c.py").write_text("# Profile: not a header\nprint('c')\n")
+
+            results = list(Headerizer(file_types).strip(root))
+
+            statuses = {r.path.name: r.status for r in results}
+            assert statuses == {"a.py": "written", "b.js": "written", "c.py": "skipped"}
+            assert (root / "a.py").read_bytes() == b"#!/usr/bin/env python\r\nprint('a')\r\n"
+            assert (root / "b.js").read_text() == "run()"
+            assert (root / "c.py").read_text() == "# Profile: not a header\nprint('c')\n"
+
+    def test_unsupported_files_are_not_counted(self, file_types):
+        """Test that the callback total only covers files that are rewritten"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "a.py").write_text("# File: a.py\n")
+            (root / "notes.txt").write_text("File: notes.txt\n")
+            calls = []
+
+            list(Headerizer(file_types).strip(root, [root / "a.py", root / "notes.txt"],
+                                              callback=lambda r, done, total: calls.append((done, total))))
+
+            assert calls == [(1, 1)]
+
+    def test_unchanged_files_are_not_read_past_the_head(self):
+        """Test that files without a change are neither fully read nor written"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "a.py"
+            path.write_text("# File: keep/a.py\n" + "x = 1\n" * 10000)
+            mtime = path.stat().st_mtime_ns
+
+            reads = []
+            real_open = open
+            def tracking_open(*args, **kwargs):
+                f = real_open(*args, **kwargs)
+                original_read = f.read
+                f.read = lambda *a: reads.append(a) or original_read(*a)
+                return f
+
+            with patch("builtins.open", tracking_open):
+                status, _ = rewrite_header_in_head(path, lambda line: line)
+            assert status == "skipped"
+            assert reads == []
+            assert path.stat().st_mtime_ns == mtime
+
+    def test_failed_rewrite_leaves_original_intact(self, file_types):
+        """Test that a disk-full error while rewriting does not truncate the file"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "a.py"
+            path.write_text("# File: a.py\nprint('a')\n")
+            real_fdopen = os.fdopen
+
+            def full_disk_fdopen(*args, **kwargs):
+                f = real_fdopen(*args, **kwargs)
+                def write(data):
+                    raise OSError(errno.ENOSPC, "No space left on device")
+                f.write = write
+                return f
+
+            with patch("headerizer.utils.os.fdopen", full_disk_fdopen):
+                results = list(Headerizer(file_types).strip(tmpdir))
+
+            assert [r.status for r in results] == ["error"]
+            assert path.read_text() == "# File: a.py\nprint('a')\n"
+            assert [p.name for p in Path(tmpdir).iterdir()] == ["a.py"]
+
+    def test_migrate_matches_whole_path_components(self, file_types):
+        """Test that prefixes only match at directory boundaries"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "a.py").write_text(f"# File: {os.path.join('src', 'a', 'x.py')}\n")
+            (root / "b.py").write_text(f"# File: {os.path.join('src', 'ab', 'x.py')}\n")
+
+            results = {r.path.name: r for r in Headerizer(file_types).migrate(root, os.path.join("src", "a"), "lib")}
+
+            assert results["a.py"].status == "written"
+            assert results["a.py"].header_path == os.path.join("lib", "x.py")
+            assert (root / "a.py").read_text() == f"# File: {os.path.join('lib', 'x.py')}\n"
+            assert results["b.py"].status == "skipped"
+
+    def test_find_renamed_files(self, file_types, make_project):
+        """Test that git rename detection reports moved files"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo = self._make_repo(Path(tmpdir) / "repo", file_types, make_project)
+            self._git(repo, 'mv', 'old/pkg', 'new')
+            (repo / "keep" / "c.py").write_text("changed\n")
+
+            renames = find_renamed_files(repo)
+            assert sorted(new.relative_to(repo).as_posix() for _, new in renames) == ["new/a.py", "new/b.js"]
+
+            assert find_renamed_files(Path(tmpdir)) is None
+
+    @patch("builtins.input", return_value="y")
+    @patch("builtins.print")
+    def test_migrate_targets_only_renamed_files(self, mock_print, mock_input, file_types, make_project):
+        """Test that migration rewrites renamed files and leaves others alone"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo = self._make_repo(Path(tmpdir) / "repo", file_types, make_project)
+            self._git(repo, 'mv', 'old/pkg', 'new')
+            # A stale header outside the move must not be touched
+            (repo / "keep" / "c.py").write_text(f"# File: {os.path.join('old', 'pkg', 'c.py')}\n")
+
+            migrate_headers(repo, file_types, os.path.join("old", "pkg"), "new")
+
+            assert (repo / "new" / "a.py").read_text().startswith(f"# File: {os.path.join('new', 'a.py')}\n")
+            assert (repo / "new" / "b.js").read_text().startswith(f"// File: {os.path.join('new', 'b.js')}\n")
+            assert (repo / "keep" / "c.py").read_text() == f"# File: {os.path.join('old', 'pkg', 'c.py')}\n"
+            assert (repo / "old" / "other.py").read_text().startswith(f"# File: {os.path.join('old', 'other.py')}\n")
+            assert any("2 renamed file(s)" in call.args[0] for call in mock_print.call_args_list)
+
+    @patch("builtins.input", return_value="y")
+    @patch("builtins.print")
+    def test_migrate_without_staged_renames_checks_every_file(self, mock_print, mock_input, file_types, make_project):
+        """Test that a move made with plain mv is still migrated"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo = self._make_repo(Path(tmpdir) / "repo", file_types, make_project)
+            shutil.move(repo / "old" / "pkg", repo / "new")
+
+            migrate_headers(repo, file_types, os.path.join("old", "pkg"), "new")
+
+            assert (repo / "new" / "a.py").read_text().startswith(f"# File: {os.path.join('new', 'a.py')}\n")
+            assert (repo / "old" / "other.py").read_text().startswith(f"# File: {os.path.join('old', 'other.py')}\n")
+            assert any("no renamed files" in call.args[0] for call in mock_print.call_args_list)
+
+    @patch("builtins.print")
+    def test_cli_rejects_unsupported_options(self, mock_print):
+        """Test that options the modes would ignore are refused"""
+        for argv in [
+            ["--strip", "--journal", "j"],
+            ["--strip", "--index", "i"],
+            ["--strip", "--results", "r.json"],
+            ["--migrate", "a", "b", "--shard", "1/2"],
+            ["--migrate", "a", "b", "--index", "i"],
+            ["--strip", "-r"],
+            ["--migrate", "a", "b", "--relative"],
+            ["--migrate", "a", "b", "--journal", "j", "--resume"],
+        ]:
+            with patch("sys.argv", ["headerizer", *argv]), \
+                    patch("headerizer.cli.strip_headers") as mock_strip, \
+                    patch("headerizer.cli.migrate_headers") as mock_migrate, \
+                    pytest.raises(SystemExit):
+                cli()
+            mock_strip.assert_not_called()
+            mock_migrate.assert_not_called()
+            assert "cannot be combined" in mock_print.call_args.args[0]
+
+        for argv in [["--since", "HEAD~1"], ["--strip", "--since", "HEAD~1"]]:
+            with patch("sys.argv", ["headerizer", *argv]), \
+                    patch("headerizer.cli.find_and_process_files") as mock_process, \
+                    patch("headerizer.cli.strip_headers") as mock_strip, \
+                    pytest.raises(SystemExit):
+                cli()
+            mock_process.assert_not_called()
+            mock_strip.assert_not_called()
+            assert "--since" in mock_print.call_args.args[0]
+
+        with patch("sys.argv", ["headerizer", "--strip", "--shard", "1/2"]), \
+                patch("headerizer.cli.strip_headers") as mock_strip:
+            cli()
+            assert mock_strip.call_args.kwargs["shard"] == (1, 2)
+
+    @patch("builtins.input", return_value="y")
+    @patch("builtins.print")
+    def test_migrate_warns_when_prefix_never_matches(self, mock_print, mock_input, file_types, make_project):
+        """Test that a relative OLD prefix against absolute headers is reported"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo = self._make_repo(Path(tmpdir) / "repo", file_types, make_project)
+            for path in (repo / "old" / "pkg").iterdir():
+                path.write_text(f"# File: {path.resolve()}\n")
+            self._git(repo, 'commit', '-am', 'Absolute headers')
+            self._git(repo, 'mv', 'old/pkg', 'new')
+
+            migrate_headers(repo, file_types, "old/pkg", "new")
+
+            assert any("No header path started with old/pkg" in call.args[0] for call in mock_print.call_args_list)